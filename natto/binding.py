@@ -2,13 +2,8 @@
 '''Binding via CFFI to the MeCab library.'''
 import cffi
 
-def _ffi_libmecab():
-    '''Returns an FFI interface to MeCab library.
-
-    Library definition is from mecab.h.
-    '''
-    ffi = cffi.FFI()
-    ffi.cdef('''
+# Library definition is from mecab.h.
+_MECAB_CDEF = '''
         struct mecab_dictionary_info_t {
             const char                        *filename;
             const char                        *charset;
@@ -98,7 +93,29 @@ def _ffi_libmecab():
         const char      *mecab_lattice_tostr(mecab_lattice_t *lattice);
         const char      *mecab_lattice_nbest_tostr(mecab_lattice_t *lattice, size_t N);
         mecab_node_t    *mecab_lattice_get_bos_node(mecab_lattice_t *lattice);
-    ''')
+'''
+
+def _ffi_libmecab():
+    '''Returns an FFI interface to MeCab library.
+
+    Uses the out-of-line ABI-mode module natto._mecab_cffi generated at
+    install time, which skips parsing the library definition; falls back to
+    parsing it in-line when running from a source checkout.
+    '''
+    try:
+        from natto._mecab_cffi import ffi
+    except ImportError:
+        ffi = cffi.FFI()
+        ffi.cdef(_MECAB_CDEF)
+    return ffi
+
+def _ffi_builder():
+    '''Returns the FFI builder for the out-of-line ABI-mode module
+    natto._mecab_cffi, for use with cffi_modules in setup.py.
+    '''
+    ffi = cffi.FFI()
+    ffi.cdef(_MECAB_CDEF)
+    ffi.set_source('natto._mecab_cffi', None)
     return ffi
 
 '''
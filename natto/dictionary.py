@@ -59,7 +59,7 @@ class DictionaryInfo(object):
         self.lsize = dptr.lsize
         self.rsize = dptr.rsize
         self.version = dptr.version
-        self.next = getattr(dptr, 'next')
+        self.next = dptr.next
 
     def is_sysdic(self):
         '''Is this a system dictionary?
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 '''The main interface to MeCab via natto-py.'''
+import functools
 import logging
 import os
 import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from .api import MeCabError
 from .binding import _ffi_libmecab
 from .dictionary import DictionaryInfo
@@ -15,6 +19,72 @@ logger = logging.getLogger('natto.mecab')
 if not logger.handlers:
     logger.addHandler(logging.NullHandler())
 
+# FFI interface and loaded MeCab library per library path, shared by every
+# MeCab instance in the process
+_LIBMECAB = {}
+
+def _libmecab(libpath):
+    '''Returns the FFI interface and the MeCab library opened from libpath,
+    loading them on first use.'''
+    lib = _LIBMECAB.get(libpath)
+    if lib is None:
+        ffi = _ffi_libmecab()
+        lib = _LIBMECAB[libpath] = (ffi, ffi.dlopen(libpath))
+    return lib
+
+def _destroy(resources):
+    '''Destroys the (destroy function, pointer) resources of a MeCab instance,
+    most recently created first.'''
+    while resources:
+        destroy, ptr = resources.pop()
+        destroy(ptr)
+
+def _release(resources, owned):
+    '''Destroys the (destroy function, pointer) resources owned by one thread,
+    most recently created first, removing them from the resources of their
+    MeCab instance; any already destroyed along with the instance are
+    skipped.'''
+    for res in reversed(owned):
+        try:
+            resources.remove(res)
+        except ValueError:
+            continue
+        destroy, ptr = res
+        destroy(ptr)
+
+class _ThreadTagger(object):
+    '''Tagger and lattice of one thread calling MeCab.parse_threaded.
+
+    Held by that thread's local storage and by any node generators parsed
+    with it, so that it is released once the thread exits and the nodes have
+    been read.
+    '''
+    __slots__ = ('tagger', 'lattice', '__weakref__')
+
+    def __init__(self, tagger, lattice):
+        self.tagger = tagger
+        self.lattice = lattice
+
+def _encoder(charset):
+    '''Returns a function encoding text to charset for MeCab, which reuses the
+    bytes from the previous call when given the very same str object again.
+
+    The text and its bytes are kept together as one tuple, so that concurrent
+    callers never see one without the other.
+    '''
+    last = (None, None)
+
+    def encode(text):
+        nonlocal last
+        prev = last
+        if prev[0] is text:
+            return prev[1]
+        btext = text.encode(charset)
+        last = (text, btext)
+        return btext
+
+    return encode
+
 class MeCab(object):
     '''The main interface to the MeCab library, wrapping the MeCab Tagger.
 
@@ -102,6 +172,7 @@ class MeCab(object):
     _ERROR_BOUNDARY = 'boundary_constraints must be re or str'
     _ERROR_FEATURE = 'feature_constraints must be tuple'
     _ERROR_NODEFORMAT = 'Could not format node with surface {}: {}'
+    _ERROR_CLOSED = 'MeCab instance has already been closed'
 
     _REPR_FMT = ('<{}.{} model={}, tagger={}, lattice={},'
                  ' libpath="{}", options={}, dicts={}, version={}>')
@@ -114,10 +185,11 @@ class MeCab(object):
     _FN_BCTOSTR = 'mecab_lattice_tostr'
 
     _KW_ASNODES = 'as_nodes'
+    _KW_ASBYTES = 'as_bytes'
     _KW_BOUNDARY = 'boundary_constraints'
     _KW_FEATURE = 'feature_constraints'
 
-    _REGEXTYPE = type(re.compile(''))
+    _REGEXTYPE = re.Pattern
 
     _STRIP_WHITESPACE = ' {}'.format(os.linesep)
 
@@ -141,6 +213,10 @@ class MeCab(object):
                      used.
         Kwargs:
             debug (bool): Flag for outputting debug messages to stderr.
+            cache_size (int): Maximum number of string results of parse to
+                keep in an LRU cache keyed on the text; 0 (the default)
+                disables caching. Only parsing to string is cached, keyed on
+                the text and any constraint.
 
         Raises:
             SystemExit: An unrecognized option was passed in.
@@ -149,12 +225,22 @@ class MeCab(object):
         '''
         try:
             env = MeCabEnv(**kwargs)
-            self.__ffi = _ffi_libmecab()
-            self.__mecab = self.__ffi.dlopen(env.libpath)
+            self.__ffi, self.__mecab = _libmecab(env.libpath)
             self.libpath = env.libpath
 
+            # MeCab resources are destroyed by close, or failing that when
+            # this instance is garbage-collected
+            self.__resources = []
+            self.__finalizer = weakref.finalize(self, _destroy,
+                                                self.__resources)
+            # not at interpreter exit, when this instance may still be in use,
+            # e.g. by atexit handlers; the process frees everything anyway
+            self.__finalizer.atexit = False
+
             # Python 2/3 string support
-            self.__bytes2str, self.__str2bytes = string_support(env.charset)
+            self.__bytes2str, _ = string_support(env.charset)
+            # per-node and per-sentence paths call decode/encode directly
+            self.__charset = env.charset
 
             # Python 2/3 sentence splitter/tokenizer support
             self.__split_pattern, self.__split_features = splitter_support()
@@ -170,266 +256,412 @@ class MeCab(object):
             if self.model == self.__ffi.NULL:
                 logger.error(self._ERROR_NULLPTR.format('Model'))
                 raise MeCabError(self._ERROR_NULLPTR.format('Model'))
+            self.__resources.append(
+                (self.__mecab.mecab_model_destroy, self.model))
+
+            # N-best is fixed for the lifetime of this instance
+            n = self.options.get('nbest', 1)
+            self.__nbest = n
+            self.__is_nbest = n > 1
+
+            # other options checked on every parse, also fixed
+            self.__is_partial = 'partial' in self.options
+            self.__is_formatted = ('output_format_type' in self.options or
+                                   'node_format' in self.options)
+
+            self.tagger = self.__new_tagger()
+            self.__resources.append((self.__mecab.mecab_destroy, self.tagger))
+            self.lattice = self.__new_lattice()
+            self.__resources.append(
+                (self.__mecab.mecab_lattice_destroy, self.lattice))
+
+            # Resolve the MeCab functions used when parsing just once,
+            # rather than looking them up on the library for every call
+            self.__set_sentence = self.__mecab.mecab_lattice_set_sentence
+            self.__parse_lattice = self.__mecab.mecab_parse_lattice
+            self.__lattice_next = self.__mecab.mecab_lattice_next
+            self.__lattice_bos_node = self.__mecab.mecab_lattice_get_bos_node
+            self.__format_node = self.__mecab.mecab_format_node
+
+            # Specialize the string result on N-best up front, so that
+            # parsing need not branch on it for every call
+            if self.__is_nbest:
+                nbest_tostr = self.__mecab.mecab_lattice_nbest_tostr
+                self.__lattice_tostr = lambda lattice: nbest_tostr(lattice, n)
+            else:
+                self.__lattice_tostr = self.__mecab.mecab_lattice_tostr
+
+            # Save value for MeCab's internal character encoding, taken from
+            # the system dictionary; the full list of dictionaries and the
+            # version string are only built when first asked for
+            dptr = self.__mecab.mecab_model_dictionary_info(self.model)
+            self.__enc = self.__bytes2str(self.__ffi.string(dptr.charset))
+            self.__dicts = None
+            self.__version = None
 
-            self.tagger = self.__mecab.mecab_model_new_tagger(self.model)
-            if self.tagger == self.__ffi.NULL:
-                logger.error(self._ERROR_NULLPTR.format('Tagger'))
-                raise MeCabError(self._ERROR_NULLPTR.format('Tagger'))
+            # Encoding with a single-entry memo of the last text encoded; a
+            # plain function, so parsers binding it do not hold this instance
+            self.__encode = _encoder(env.charset)
 
-            self.lattice = self.__mecab.mecab_model_new_lattice(self.model)
-            if self.lattice == self.__ffi.NULL:
-                logger.error(self._ERROR_NULLPTR.format('Lattice'))
-                raise MeCabError(self._ERROR_NULLPTR.format('Lattice'))
+            # tagger and lattice of each thread calling parse_threaded
+            self.__local = threading.local()
 
-            n = self.options.get('nbest', 1)
-            if n > 1:
-                req_type = self.MECAB_LATTICE_NBEST
+            # parsing without constraints, specialized for this instance
+            self.__parse_plain = self.__plain_parser(self.tagger, self.lattice)
+
+            # Optional LRU cache of string results, for repeated inputs
+            cache_size = kwargs.get('cache_size', 0)
+            if cache_size:
+                # cache a function holding this instance only weakly, as the
+                # cache is itself held by this instance
+                parse_text = weakref.WeakMethod(self.__parse_text)
+
+                def parse_cached(text, constraint):
+                    return parse_text()(text, constraint)
+
+                self.__parse_cached = functools.lru_cache(
+                    maxsize=cache_size)(parse_cached)
             else:
-                req_type = self.MECAB_LATTICE_ONE_BEST
-            self.__mecab.mecab_lattice_set_request_type(self.lattice, req_type)
+                self.__parse_cached = None
+        except EnvironmentError as err:
+            logger.error(self._ERROR_INIT.format(str(err)))
+            raise MeCabError(err)
+        except ValueError as verr:
+            logger.error(self._ERROR_INIT.format(str(verr)))
+            raise MeCabError(self._ERROR_INIT.format(str(verr)))
 
-            if 'partial' in self.options:
-                self.__mecab.mecab_lattice_add_request_type(
-                    self.lattice, self.MECAB_LATTICE_PARTIAL)
+    def __new_tagger(self):
+        '''Returns a new MeCab tagger for this instance's model.
 
-            if 'marginal' in self.options:
-                self.__mecab.mecab_lattice_add_request_type(
-                    self.lattice, self.MECAB_LATTICE_MARGINAL_PROB)
+        Raises:
+            MeCabError: The tagger could not be created.
+        '''
+        tagger = self.__mecab.mecab_model_new_tagger(self.model)
+        if tagger == self.__ffi.NULL:
+            logger.error(self._ERROR_NULLPTR.format('Tagger'))
+            raise MeCabError(self._ERROR_NULLPTR.format('Tagger'))
+        return tagger
 
-            if 'all_morphs' in self.options:
-                # required when node parsing
-                self.__mecab.mecab_lattice_add_request_type(
-                    self.lattice, self.MECAB_LATTICE_ALL_MORPHS)
+    def __new_lattice(self):
+        '''Returns a new MeCab lattice for this instance's model, with its
+        request type set according to the MeCab options in use.
 
-            if 'allocate_sentence' in self.options:
-                self.__mecab.mecab_lattice_add_request_type(
-                    self.lattice, self.MECAB_LATTICE_ALLOCATE_SENTENCE)
+        Raises:
+            MeCabError: The lattice could not be created.
+        '''
+        lattice = self.__mecab.mecab_model_new_lattice(self.model)
+        if lattice == self.__ffi.NULL:
+            logger.error(self._ERROR_NULLPTR.format('Lattice'))
+            raise MeCabError(self._ERROR_NULLPTR.format('Lattice'))
+
+        if self.__is_nbest:
+            req_type = self.MECAB_LATTICE_NBEST
+        else:
+            req_type = self.MECAB_LATTICE_ONE_BEST
+        self.__mecab.mecab_lattice_set_request_type(lattice, req_type)
 
-            # Prepare copy for list of MeCab dictionaries
-            self.dicts = []
+        if 'partial' in self.options:
+            self.__mecab.mecab_lattice_add_request_type(
+                lattice, self.MECAB_LATTICE_PARTIAL)
+
+        if 'marginal' in self.options:
+            self.__mecab.mecab_lattice_add_request_type(
+                lattice, self.MECAB_LATTICE_MARGINAL_PROB)
+
+        if 'all_morphs' in self.options:
+            # required when node parsing
+            self.__mecab.mecab_lattice_add_request_type(
+                lattice, self.MECAB_LATTICE_ALL_MORPHS)
+
+        if 'allocate_sentence' in self.options:
+            self.__mecab.mecab_lattice_add_request_type(
+                lattice, self.MECAB_LATTICE_ALLOCATE_SENTENCE)
+
+        return lattice
+
+    @property
+    def dicts(self):
+        '''List of DictionaryInfo for the dictionaries used by MeCab.
+
+        The list is built from the MeCab model on first access and cached.
+        '''
+        if self.__dicts is None:
+            dicts = []
             dptr = self.__mecab.mecab_model_dictionary_info(self.model)
             while dptr != self.__ffi.NULL:
                 fpath = self.__bytes2str(self.__ffi.string(dptr.filename))
                 fpath = os.path.abspath(fpath)
                 chset = self.__bytes2str(self.__ffi.string(dptr.charset))
-                self.dicts.append(DictionaryInfo(dptr, fpath, chset))
-                dptr = getattr(dptr, 'next')
+                dicts.append(DictionaryInfo(dptr, fpath, chset))
+                dptr = dptr.next
+            self.__dicts = dicts
+        return self.__dicts
 
-            # Save value for MeCab's internal character encoding
-            self.__enc = self.dicts[0].charset
+    def cache_info(self):
+        '''Returns the statistics of the parse result cache.
 
-            # Set MeCab version string
-            self.version = self.__bytes2str(
+        :return: named tuple of hits, misses, maxsize and currsize, as from
+            functools.lru_cache; or None if caching was not enabled with
+            cache_size.
+        '''
+        if self.__parse_cached is None:
+            return None
+        return self.__parse_cached.cache_info()
+
+    @property
+    def version(self):
+        '''MeCab version string, obtained on first access and cached.'''
+        if self.__version is None:
+            self.__version = self.__bytes2str(
                 self.__ffi.string(self.__mecab.mecab_version()))
-        except EnvironmentError as err:
-            logger.error(self._ERROR_INIT.format(str(err)))
-            raise MeCabError(err)
-        except ValueError as verr:
-            logger.error(self._ERROR_INIT.format(str(verr)))
-            raise MeCabError(self._ERROR_INIT.format(str(verr)))
+        return self.__version
+
+    def close(self):
+        '''Destroys the MeCab lattice, tagger and model of this instance.
 
-    def __del__(self):
-        if hasattr(self, 'lattice') and hasattr(self, '_MeCab__ffi'):
-            if self.lattice != self.__ffi.NULL:
-                self.__mecab.mecab_lattice_destroy(self.lattice)
-        if hasattr(self, 'tagger') and hasattr(self, '_MeCab__ffi'):
-            if self.tagger != self.__ffi.NULL:
-                self.__mecab.mecab_destroy(self.tagger)
-        if hasattr(self, 'model') and hasattr(self, '_MeCab__ffi'):
-            if self.model != self.__ffi.NULL:
-                self.__mecab.mecab_model_destroy(self.model)
-        if hasattr(self, '_MeCab__mecab'):
-            del self.__mecab
-        if hasattr(self, '_MeCab__ffi'):
-            del self.__ffi
+        This is called on leaving a with block; the instance cannot be used
+        for parsing afterwards. Calling close again has no effect.
+        '''
+        if self.__finalizer.alive:
+            # dicts is read from the model, so must be built before the model
+            # is destroyed to remain available once closed
+            self.dicts
+        self.__finalizer()
+        self.lattice = self.tagger = self.model = self.__ffi.NULL
 
     def __enter__(self):
         return self
 
     def __exit__(self, type, value, traceback):
-        self.__del__()
+        self.close()
 
-    def __parse_tostr(self, text, **kwargs):
-        '''Builds and returns the MeCab function for parsing Unicode text.
+    def __set_lattice_sentence(self, lattice, text, kwargs):
+        '''Sets the text as the sentence of the lattice, along with any
+        boundary or feature constraints given in kwargs.
 
         Args:
-            fn_name: MeCab function name that determines the function
-                behavior, either 'mecab_sparse_tostr' or
-                'mecab_nbest_sparse_tostr'.
+            lattice: MeCab lattice to hold the sentence.
+            text: Unicode text to parse.
+            kwargs: keyword arguments of the parse call.
 
         Returns:
-            A function definition, tailored to parsing Unicode text and
-            returning the result as a string suitable for display on stdout,
-            using either the default or N-best behavior.
+            The encoded sentence, plus the encoded features when feature
+            constrained; MeCab only stores pointers to these, so they must
+            be kept alive until the results have been read.
         '''
-        n = self.options.get('nbest', 1)
-
         if self._KW_BOUNDARY in kwargs:
             patt = kwargs.get(self._KW_BOUNDARY, '.')
             tokens = list(self.__split_pattern(text, patt))
-            text = ''.join([t[0] for t in tokens])
-
-            btext = self.__str2bytes(text)
-            self.__mecab.mecab_lattice_set_sentence(self.lattice, btext)
-
-            bpos = 0
-            self.__mecab.mecab_lattice_set_boundary_constraint(
-                self.lattice, bpos, self.MECAB_TOKEN_BOUNDARY)
-
-            for (token, match) in tokens:
-                bpos += 1
-                if match:
-                    mark = self.MECAB_INSIDE_TOKEN
-                else:
-                    mark = self.MECAB_ANY_BOUNDARY
-
-                for _ in range(1, len(self.__str2bytes(token))):
-                    self.__mecab.mecab_lattice_set_boundary_constraint(
-                        self.lattice, bpos, mark)
-                    bpos += 1
-                self.__mecab.mecab_lattice_set_boundary_constraint(
-                    self.lattice, bpos, self.MECAB_TOKEN_BOUNDARY)
+            btokens = [t[0].encode(self.__charset) for t in tokens]
+            btext = b''.join(btokens)
+            self.__set_sentence(lattice, btext)
+
+            self.__set_boundary_constraints(lattice, tokens, btokens)
+            return btext
         elif self._KW_FEATURE in kwargs:
             features = kwargs.get(self._KW_FEATURE, ())
-            fd = {morph: self.__str2bytes(feat) for morph, feat in features}
-
             tokens = self.__split_features(text, [e[0] for e in features])
-            text = ''.join([t[0] for t in tokens])
-
-            btext = self.__str2bytes(text)
-            self.__mecab.mecab_lattice_set_sentence(self.lattice, btext)
-
-            bpos = 0
-            for chunk, match in tokens:
-                c = len(self.__str2bytes(chunk))
-                if match == True:
-                    self.__mecab.mecab_lattice_set_feature_constraint(
-                        self.lattice, bpos, bpos+c, fd[chunk])
-                bpos += c
+            btokens = [t[0].encode(self.__charset) for t in tokens]
+            btext = b''.join(btokens)
+            self.__set_sentence(lattice, btext)
+
+            fd = self.__set_feature_constraints(lattice, tokens, btokens,
+                                                features)
+            return (btext, fd)
         else:
-            btext = self.__str2bytes(text)
-            self.__mecab.mecab_lattice_set_sentence(self.lattice, btext)
+            btext = self.__encode(text)
+            self.__set_sentence(lattice, btext)
+            return btext
 
-        self.__mecab.mecab_parse_lattice(self.tagger, self.lattice)
+    def __set_boundary_constraints(self, lattice, tokens, btokens):
+        '''Marks the morpheme boundaries of the tokens on the lattice.
 
-        if n > 1:
-            res = self.__mecab.mecab_lattice_nbest_tostr(self.lattice, n)
-        else:
-            res = self.__mecab.mecab_lattice_tostr(self.lattice)
+        Setting the sentence resets every position to MECAB_ANY_BOUNDARY, so
+        only the token boundaries and the insides of matched tokens need to be
+        marked, rather than every byte of the sentence.
+
+        Args:
+            lattice: MeCab lattice holding the sentence made from the tokens.
+            tokens: (token, match) tuples from the pattern splitter.
+            btokens: the encoded tokens, making up the sentence.
+        '''
+        set_constraint = self.__mecab.mecab_lattice_set_boundary_constraint
+        boundary = self.MECAB_TOKEN_BOUNDARY
+        inside = self.MECAB_INSIDE_TOKEN
+
+        bpos = 0
+        set_constraint(lattice, bpos, boundary)
+
+        for (token, match), btoken in zip(tokens, btokens):
+            blen = len(btoken)
+            if match:
+                for i in range(bpos + 1, bpos + blen):
+                    set_constraint(lattice, i, inside)
+            bpos += blen
+            set_constraint(lattice, bpos, boundary)
+
+    def __set_feature_constraints(self, lattice, tokens, btokens, features):
+        '''Sets the feature of each matched token as a constraint on the
+        lattice.
+
+        Args:
+            lattice: MeCab lattice holding the sentence made from the tokens.
+            tokens: (token, match) tuples from the features splitter.
+            btokens: the encoded tokens, making up the sentence.
+            features: (morpheme, feature) tuples of the constraints.
+
+        Returns:
+            Dictionary of the encoded feature for each morpheme; MeCab only
+            stores pointers to these, so it must be kept alive until the
+            lattice has been parsed.
+        '''
+        set_constraint = self.__mecab.mecab_lattice_set_feature_constraint
+        charset = self.__charset
+        fd = {morph: feat.encode(charset) for morph, feat in features}
+
+        bpos = 0
+        for (chunk, match), bchunk in zip(tokens, btokens):
+            blen = len(bchunk)
+            if match:
+                set_constraint(lattice, bpos, bpos + blen, fd[chunk])
+            bpos += blen
+        return fd
+
+    def __parse_tostr(self, tagger, lattice, text, **kwargs):
+        '''Parses Unicode text with the given tagger and lattice.
+
+        Args:
+            tagger: MeCab tagger to parse with.
+            lattice: MeCab lattice to hold the sentence and parse results.
+            text: Unicode text to parse.
+
+        Returns:
+            The result as a string suitable for display on stdout, using
+            either the default or N-best behavior.
+        '''
+        # the sentence bytes must outlive parsing and reading the results
+        keep = self.__set_lattice_sentence(lattice, text, kwargs)
+
+        self.__parse_lattice(tagger, lattice)
+
+        res = self.__lattice_tostr(lattice)
 
         if res != self.__ffi.NULL:
             raw = self.__ffi.string(res)
-            return self.__bytes2str(raw).strip(self._STRIP_WHITESPACE)
+            return raw.decode(self.__charset).strip(self._STRIP_WHITESPACE)
         else:
-            err = self.__mecab.mecab_lattice_strerror(self.lattice)
+            err = self.__mecab.mecab_lattice_strerror(lattice)
             logger.error(self.__bytes2str(self.__ffi.string(err)))
             raise MeCabError(self.__bytes2str(self.__ffi.string(err)))
 
-    def __parse_tonodes(self, text, **kwargs):
-        '''Builds and returns the MeCab function for parsing to nodes using
-        morpheme boundary constraints.
+    def __parse_tonodes(self, tagger, lattice, text, **kwargs):
+        '''Parses Unicode text to nodes with the given tagger and lattice.
 
         Args:
-            format_feature: flag indicating whether or not to format the feature
-                value for each node yielded.
+            tagger: MeCab tagger to parse with.
+            lattice: MeCab lattice to hold the sentence and parse results.
+            text: Unicode text to parse.
 
         Returns:
-            A function which returns a Generator, tailored to using boundary
-            constraints and parsing as nodes, using either the default or
-            N-best behavior.
+            A Generator yielding MeCabNode instances, using either the default
+            or N-best behavior.
         '''
-        n = self.options.get('nbest', 1)
+        # the generator may be started after this instance has been closed
+        self.__check_open()
+        n = self.__nbest
 
         try:
-            if self._KW_BOUNDARY in kwargs:
-                patt = kwargs.get(self._KW_BOUNDARY, '.')
-                tokens = list(self.__split_pattern(text, patt))
-                text = ''.join([t[0] for t in tokens])
-
-                btext = self.__str2bytes(text)
-                self.__mecab.mecab_lattice_set_sentence(self.lattice, btext)
-
-                bpos = 0
-                self.__mecab.mecab_lattice_set_boundary_constraint(
-                    self.lattice, bpos, self.MECAB_TOKEN_BOUNDARY)
-
-                for (token, match) in tokens:
-                    bpos += 1
-                    if match:
-                        mark = self.MECAB_INSIDE_TOKEN
-                    else:
-                        mark = self.MECAB_ANY_BOUNDARY
-
-                    for _ in range(1, len(self.__str2bytes(token))):
-                        self.__mecab.mecab_lattice_set_boundary_constraint(
-                            self.lattice, bpos, mark)
-                        bpos += 1
-                    self.__mecab.mecab_lattice_set_boundary_constraint(
-                        self.lattice, bpos, self.MECAB_TOKEN_BOUNDARY)
-            elif self._KW_FEATURE in kwargs:
-                features = kwargs.get(self._KW_FEATURE, ())
-                fd = {morph: self.__str2bytes(feat) for morph, feat in features}
-
-                tokens = self.__split_features(text, [e[0] for e in features])
-                text = ''.join([t[0] for t in tokens])
-
-                btext = self.__str2bytes(text)
-                self.__mecab.mecab_lattice_set_sentence(self.lattice, btext)
-
-                bpos = 0
-                for chunk, match in tokens:
-                    c = len(self.__str2bytes(chunk))
-                    if match:
-                        self.__mecab.mecab_lattice_set_feature_constraint(
-                            self.lattice, bpos, bpos+c, fd[chunk])
-                    bpos += c
+            # the sentence bytes must outlive parsing and the node walk
+            keep = self.__set_lattice_sentence(lattice, text, kwargs)
+
+            self.__parse_lattice(tagger, lattice)
+
+            # bind everything needed per node to locals before walking
+            NULL = self.__ffi.NULL
+            ffi_string = self.__ffi.string
+            ffi_unpack = self.__ffi.unpack
+            bytes2str = self.__bytes2str
+            charset = self.__charset
+            BOS = MeCabNode.BOS_NODE
+            format_node = self.__format_node
+            strip_ws = self._STRIP_WHITESPACE.encode(charset)
+
+            # surface and feature bytes are copied out of the lattice right
+            # away, but only decoded if the caller reads them; they are exact
+            # slices with no surrounding whitespace, so need no stripping
+            def decode(raw):
+                return raw.decode(charset)
+
+            # left as bytes in the dictionary charset if so requested
+            if kwargs.get(self._KW_ASBYTES, False):
+                node_decode = None
             else:
-                btext = self.__str2bytes(text)
-                self.__mecab.mecab_lattice_set_sentence(self.lattice, btext)
+                node_decode = decode
 
-            self.__mecab.mecab_parse_lattice(self.tagger, self.lattice)
+            if self.__is_nbest:
+                bos_nodes = self.__nbest_bos_nodes(lattice, n)
+            else:
+                bos_nodes = (self.__lattice_bos_node(lattice),)
 
-            for _ in range(n):
-                check = self.__mecab.mecab_lattice_next(self.lattice)
-                if n == 1 or check:
-                    nptr = self.__mecab.mecab_lattice_get_bos_node(self.lattice)
-                    while nptr != self.__ffi.NULL:
+            # the choice of feature source is fixed by the options, so it is
+            # made once here rather than for every node
+            if self.__is_formatted:
+                for nptr in bos_nodes:
+                    while nptr != NULL:
+                        # skip over any BOS nodes, since mecab does
+                        if nptr.stat != BOS:
+                            raws = ffi_unpack(nptr.surface, nptr.length)
+                            sp = format_node(tagger, nptr)
+                            if sp == NULL:
+                                err = self.__mecab.mecab_strerror(tagger)
+                                err = bytes2str(ffi_string(err))
+                                msg = self._ERROR_NODEFORMAT.format(
+                                        decode(raws), err)
+                                raise MeCabError(msg)
+                            # node-format output usually ends in newline
+                            rawf = ffi_string(sp).strip(strip_ws)
+                            yield MeCabNode(nptr, raws, rawf, node_decode)
+                        nptr = nptr.next
+            else:
+                for nptr in bos_nodes:
+                    while nptr != NULL:
                         # skip over any BOS nodes, since mecab does
-                        if nptr.stat != MeCabNode.BOS_NODE:
-                            raws = self.__ffi.string(
-                                nptr.surface[0:nptr.length])
-                            surf = self.__bytes2str(raws).strip(self._STRIP_WHITESPACE)
-
-                            if 'output_format_type' in self.options or \
-                               'node_format' in self.options:
-                                sp = self.__mecab.mecab_format_node(
-                                    self.tagger, nptr)
-                                if sp != self.__ffi.NULL:
-                                    rawf = self.__ffi.string(sp)
-                                else:
-                                    err = self.__mecab.mecab_strerror(
-                                            self.tagger)
-                                    err = self.__bytes2str(
-                                            self.__ffi.string(err))
-                                    msg = self._ERROR_NODEFORMAT.format(
-                                            surf, err)
-                                    raise MeCabError(msg)
-                            else:
-                                rawf = self.__ffi.string(nptr.feature)
-                            feat = self.__bytes2str(rawf).strip(self._STRIP_WHITESPACE)
-
-                            mnode = MeCabNode(nptr, surf, feat)
-                            yield mnode
-                        nptr = getattr(nptr, 'next')
+                        if nptr.stat != BOS:
+                            raws = ffi_unpack(nptr.surface, nptr.length)
+                            rawf = ffi_string(nptr.feature)
+                            yield MeCabNode(nptr, raws, rawf, node_decode)
+                        nptr = nptr.next
         except GeneratorExit:
             logger.debug('close invoked on generator')
         except MeCabError:
             raise
         except:
-            err = self.__mecab.mecab_lattice_strerror(self.lattice)
+            err = self.__mecab.mecab_lattice_strerror(lattice)
             logger.error(self.__bytes2str(self.__ffi.string(err)))
             raise MeCabError(self.__bytes2str(self.__ffi.string(err)))
 
+    def __parse_text(self, text, constraint=None):
+        '''Parses Unicode text to a string, using this instance's tagger and
+        lattice, with an optional (keyword, value) constraint.'''
+        if constraint is None:
+            return self.__parse_plain(text)
+        return self.__parse_tostr(self.tagger, self.lattice, text,
+                                  **{constraint[0]: constraint[1]})
+
+    def __nbest_bos_nodes(self, lattice, n):
+        '''Yields the BOS node of each of the N-best results in turn.
+
+        Args:
+            lattice: the lattice holding the N-best parse results.
+            n: the number of N-best results to iterate over.
+
+        Returns:
+            A Generator yielding the BOS node pointer of each N-best result.
+        '''
+        for _ in range(n):
+            if self.__lattice_next(lattice):
+                yield self.__lattice_bos_node(lattice)
+
     def __repr__(self):
         '''Returns a string representation of this MeCab instance.'''
         return self._REPR_FMT.format(type(self).__module__,
@@ -450,6 +682,10 @@ class MeCab(object):
         :param as_nodes: return generator of MeCabNodes if True;
             or string if False.
         :type as_nodes: bool, defaults to False
+        :param as_bytes: with as_nodes, leave the node surface and feature as
+            bytes in the dictionary charset rather than decoding them; only
+            applies to node output, and has no effect on the string result.
+        :type as_bytes: bool, defaults to False
         :param boundary_constraints: regular expression for morpheme boundary
             splitting; if non-None and feature_constraints is None, then
             boundary constraint parsing will be used.
@@ -463,19 +699,217 @@ class MeCab(object):
             or a Generator yielding the MeCabNode instances.
         :raises: MeCabError
         '''
+        self.__check_open()
+        self.__check_args(text, kwargs)
+
+        # plain parse to string, by far the most common call
+        if not kwargs:
+            if self.__parse_cached is not None:
+                return self.__parse_cached(text, None)
+            return self.__parse_plain(text)
+
+        as_nodes = kwargs.get(self._KW_ASNODES, False)
+
+        if as_nodes:
+            return self.__parse_tonodes(self.tagger, self.lattice, text,
+                                        **kwargs)
+        elif self.__parse_cached is not None:
+            # boundary constraints take precedence over feature constraints
+            if self._KW_BOUNDARY in kwargs:
+                constraint = (self._KW_BOUNDARY, kwargs[self._KW_BOUNDARY])
+            elif self._KW_FEATURE in kwargs:
+                constraint = (self._KW_FEATURE, kwargs[self._KW_FEATURE])
+            else:
+                constraint = None
+            try:
+                hash(constraint)
+            except TypeError:
+                # e.g. feature constraints holding lists, cannot be cached
+                return self.__parse_tostr(self.tagger, self.lattice, text,
+                                          **kwargs)
+            return self.__parse_cached(text, constraint)
+        else:
+            return self.__parse_tostr(self.tagger, self.lattice, text,
+                                      **kwargs)
+
+    def parse_threaded(self, text, **kwargs):
+        '''Parse the given text like parse, but with a tagger and lattice
+        belonging to the calling thread, so that one MeCab instance may be
+        shared by many threads parsing at the same time.
+
+        Each thread's tagger and lattice are created on its first call, and
+        kept until the thread exits, or any nodes parsed with them have been
+        read, or this instance is closed. cffi releases the GIL while calling
+        into MeCab, so the threads parse in parallel.
+
+        Accepts the same arguments, and returns the same results, as parse;
+        string results are not cached.
+
+        :raises: MeCabError
+        '''
+        self.__check_open()
+        self.__check_args(text, kwargs)
+
+        owned = self.__thread_tagger()
+        if kwargs.get(self._KW_ASNODES, False):
+            return self.__parse_tonodes_owned(owned, text, kwargs)
+        else:
+            return self.__parse_tostr(owned.tagger, owned.lattice, text,
+                                      **kwargs)
+
+    def __parse_tonodes_owned(self, owned, text, kwargs):
+        '''Parses text to nodes with the tagger and lattice of a thread,
+        holding on to them until the nodes have been read, even should the
+        thread exit first.'''
+        yield from self.__parse_tonodes(owned.tagger, owned.lattice, text,
+                                        **kwargs)
+
+    def __thread_tagger(self):
+        '''Returns the _ThreadTagger of the calling thread, creating it on
+        first use; its tagger and lattice are destroyed once it is no longer
+        referenced after the thread exits, or along with this instance.'''
+        try:
+            owned = self.__local.owned
+        except AttributeError:
+            res = [(self.__mecab.mecab_destroy, self.__new_tagger())]
+            self.__resources.extend(res)
+            res.append((self.__mecab.mecab_lattice_destroy,
+                        self.__new_lattice()))
+            self.__resources.append(res[-1])
+
+            owned = _ThreadTagger(res[0][1], res[1][1])
+            finalizer = weakref.finalize(owned, _release, self.__resources,
+                                         res)
+            finalizer.atexit = False
+            self.__local.owned = owned
+        return owned
+
+    def parse_many(self, texts, workers=1, **kwargs):
+        '''Parse each of the given texts and return the results from MeCab.
+
+        Accepts the same keyword arguments as parse, which apply to every
+        text. When parsing as nodes, the nodes for each text are collected
+        into a list.
+
+        With more than one worker, the texts are split into contiguous
+        shards, each parsed on its own thread with a separate MeCab tagger
+        and lattice. cffi releases the GIL while calling into MeCab, so the
+        shards are parsed in parallel. The pointers held by any nodes so
+        returned refer to lattices that have since been reused or destroyed,
+        and should not be dereferenced.
+
+        :param texts: the texts to parse.
+        :type texts: iterable of str
+        :param workers: number of threads to parse with.
+        :type workers: int, defaults to 1
+        :return: A list of MeCab output strings; or a list of lists of
+            MeCabNode instances, in the same order as texts.
+        :raises: MeCabError
+        '''
+        self.__check_open()
+        texts = list(texts)
+        for text in texts:
+            self.__check_args(text, kwargs)
+
+        if workers <= 1 or len(texts) <= 1:
+            return self.__parse_shard(self.tagger, self.lattice, texts, kwargs)
+
+        size = -(-len(texts) // workers)
+        shards = [texts[i:i+size] for i in range(0, len(texts), size)]
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            results = executor.map(
+                lambda shard: self.__parse_new_shard(shard, kwargs), shards)
+            return [res for shard in results for res in shard]
+
+    def __parse_shard(self, tagger, lattice, texts, kwargs):
+        '''Parses the texts in turn with the given tagger and lattice,
+        returning a list of the results.'''
+        if kwargs.get(self._KW_ASNODES, False):
+            return [list(self.__parse_tonodes(tagger, lattice, text, **kwargs))
+                    for text in texts]
+        elif self._KW_BOUNDARY in kwargs or self._KW_FEATURE in kwargs:
+            return [self.__parse_tostr(tagger, lattice, text, **kwargs)
+                    for text in texts]
+        else:
+            parse_plain = self.__plain_parser(tagger, lattice)
+            return [parse_plain(text) for text in texts]
+
+    def __plain_parser(self, tagger, lattice):
+        '''Returns a function parsing text without constraints to a string
+        with the given tagger and lattice.
+
+        Everything the function needs is looked up once here and bound in
+        its closure, so each call is just the calls into MeCab plus the
+        encoding and decoding of the text. The closure holds no reference
+        back to this instance, which keeps it out of a reference cycle.
+        '''
+        NULL = self.__ffi.NULL
+        ffi_string = self.__ffi.string
+        encode = self.__encode
+        set_sentence = self.__set_sentence
+        parse_lattice = self.__parse_lattice
+        lattice_tostr = self.__lattice_tostr
+        strerror = self.__mecab.mecab_lattice_strerror
+        bytes2str = self.__bytes2str
+        charset = self.__charset
+        strip_ws = self._STRIP_WHITESPACE
+
+        def parse_plain(text):
+            btext = encode(text)
+            set_sentence(lattice, btext)
+            parse_lattice(tagger, lattice)
+            res = lattice_tostr(lattice)
+            if res == NULL:
+                err = bytes2str(ffi_string(strerror(lattice)))
+                logger.error(err)
+                raise MeCabError(err)
+            return ffi_string(res).decode(charset).strip(strip_ws)
+
+        return parse_plain
+
+    def __parse_new_shard(self, texts, kwargs):
+        '''Parses the texts with a tagger and lattice of their own, so that
+        shards may be parsed concurrently, returning a list of the results.'''
+        tagger = self.__new_tagger()
+        try:
+            lattice = self.__new_lattice()
+            try:
+                return self.__parse_shard(tagger, lattice, texts, kwargs)
+            finally:
+                self.__mecab.mecab_lattice_destroy(lattice)
+        finally:
+            self.__mecab.mecab_destroy(tagger)
+
+    def __check_open(self):
+        '''Checks that the MeCab resources have not yet been destroyed.
+
+        Raises:
+            MeCabError: This instance was already closed.
+        '''
+        if self.tagger == self.__ffi.NULL:
+            logger.error(self._ERROR_CLOSED)
+            raise MeCabError(self._ERROR_CLOSED)
+
+    def __check_args(self, text, kwargs):
+        '''Checks the text and keyword arguments for parsing.
+
+        Raises:
+            MeCabError: The text or a constraint argument is invalid.
+        '''
         if text is None:
             logger.error(self._ERROR_EMPTY_STR)
             raise MeCabError(self._ERROR_EMPTY_STR)
         elif not isinstance(text, str):
             logger.error(self._ERROR_NOTSTR)
             raise MeCabError(self._ERROR_NOTSTR)
-        elif 'partial' in self.options and not text.endswith("\n"):
+        elif self.__is_partial and not text.endswith("\n"):
             logger.error(self._ERROR_MISSING_NL)
             raise MeCabError(self._ERROR_MISSING_NL)
 
         if self._KW_BOUNDARY in kwargs:
             val = kwargs[self._KW_BOUNDARY]
-            if not isinstance(val, self._REGEXTYPE) and not isinstance(val, str):
+            if not isinstance(val, (self._REGEXTYPE, str)):
                 logger.error(self._ERROR_BOUNDARY)
                 raise MeCabError(self._ERROR_BOUNDARY)
         elif self._KW_FEATURE in kwargs:
@@ -484,13 +918,6 @@ class MeCab(object):
                 logger.error(self._ERROR_FEATURE)
                 raise MeCabError(self._ERROR_FEATURE)
 
-        as_nodes = kwargs.get(self._KW_ASNODES, False)
-
-        if as_nodes:
-            return self.__parse_tonodes(text, **kwargs)
-        else:
-            return self.__parse_tostr(text, **kwargs)
-
 '''
 Copyright (c) 2022, Brooke M. Fujita.
 All rights reserved.
@@ -15,8 +15,10 @@ class MeCabNode(object):
     :ivar bnext: Pointer to the node which starts at the same position.
     :ivar rpath: Pointer to the right path; None if MECAB_ONE_BEST mode.
     :ivar lpath: Pointer to the right path; None if MECAB_ONE_BEST mode.
-    :ivar surface: Surface string, Unicode.
-    :ivar feature: Feature string, Unicode.
+    :ivar surface: Surface string, Unicode; bytes in the dictionary charset
+        when parsed with as_bytes=True.
+    :ivar feature: Feature string, Unicode; bytes in the dictionary charset
+        when parsed with as_bytes=True.
     :ivar nodeid: Unique node id.
     :ivar length: Length of surface form.
     :ivar rlength: Length of the surface form including leading white space.
@@ -90,6 +92,12 @@ class MeCabNode(object):
     '''
     _REPR_FMT = '<{}.{} node={}, stat={}, surface="{}", feature="{}">'
 
+    # one node per morpheme is created, so there is no per-instance dict
+    __slots__ = ('ptr', 'prev', 'next', 'enext', 'bnext', 'rpath', 'lpath',
+                 '__surface', '__feature', '__decode', 'nodeid', 'length',
+                 'rlength', 'rcattr', 'lcattr', 'posid', 'char_type', 'stat',
+                 'isbest', 'alpha', 'beta', 'prob', 'wcost', 'cost')
+
     # Normal MeCab node defined in the dictionary.
     NOR_NODE = 0
     # Unknown MeCab node not defined in the dictionary.
@@ -101,17 +109,22 @@ class MeCabNode(object):
     # Virtual node representing the end of an N-Best MeCab node list.
     EON_NODE = 4
 
-    def __init__(self, nptr, surface, feature):
-        '''Initializes the MeCab node and its attributes.'''
+    def __init__(self, nptr, surface, feature, decode=None):
+        '''Initializes the MeCab node and its attributes.
+
+        If decode is given, surface and feature are the raw bytes copied out
+        of the lattice, and are only decoded with it when first accessed.
+        '''
+        self.__decode = decode
         self.ptr = nptr
         self.prev = nptr.prev
-        self.next = getattr(nptr, 'next')
+        self.next = nptr.next
         self.enext = nptr.enext
         self.bnext = nptr.bnext
         self.rpath = nptr.rpath
         self.lpath = nptr.lpath
-        self.surface = surface
-        self.feature = feature
+        self.__surface = surface
+        self.__feature = feature
         self.nodeid = nptr.id
         self.length = nptr.length
         self.rlength = nptr.rlength
@@ -127,6 +140,28 @@ class MeCabNode(object):
         self.wcost = nptr.wcost
         self.cost = nptr.cost
 
+    @property
+    def surface(self):
+        '''Surface string, Unicode.'''
+        if self.__decode is not None and isinstance(self.__surface, bytes):
+            self.__surface = self.__decode(self.__surface)
+        return self.__surface
+
+    @surface.setter
+    def surface(self, value):
+        self.__surface = value
+
+    @property
+    def feature(self):
+        '''Feature string, Unicode.'''
+        if self.__decode is not None and isinstance(self.__feature, bytes):
+            self.__feature = self.__decode(self.__feature)
+        return self.__feature
+
+    @feature.setter
+    def feature(self, value):
+        self.__feature = value
+
     def is_nor(self):
         '''Is this a normal node, defined in a dictionary?
 
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 '''Helper class for parsing MeCab options.'''
-import argparse
 import logging
+import re
 from .support import string_support
 
 logger = logging.getLogger('natto.option_parse')
@@ -30,14 +30,59 @@ class OptionParse(object):
                        '-t' : 'theta',
                        '-c' : 'cost_factor'}
 
-    _BOOLEAN_OPTIONS = ['all-morphs',
-                        'partial',
-                        'marginal',
-                        'allocate-sentence']
+    # Option names in the order they are checked and emitted
+    _OPTION_NAMES = tuple(_SUPPORTED_OPTS.values())
+
+    # Long-form (hyphenated) key of each option name
+    _LONG_FORMS = {name: name.replace('_', '-')
+                   for name in _SUPPORTED_OPTS.values()}
+
+    # Short- and long-form of each option name, as shown in error messages
+    _FLAGS = {name: '{}/--{}'.format(short, name.replace('_', '-'))
+              for short, name in _SUPPORTED_OPTS.items()}
+
+    # Type of the value taken by each option; None for boolean flags
+    _OPTION_TYPES = {'rcfile'             : str,
+                     'dicdir'             : str,
+                     'userdic'            : str,
+                     'lattice_level'      : int,
+                     'output_format_type' : str,
+                     'all_morphs'         : None,
+                     'nbest'              : int,
+                     'partial'            : None,
+                     'marginal'           : None,
+                     'max_grouping_size'  : int,
+                     'node_format'        : str,
+                     'unk_format'         : str,
+                     'bos_format'         : str,
+                     'eos_format'         : str,
+                     'eon_format'         : str,
+                     'unk_feature'        : str,
+                     'input_buffer_size'  : int,
+                     'allocate_sentence'  : None,
+                     'theta'              : float,
+                     'cost_factor'        : int}
+
+    _BOOLEAN_OPTIONS = frozenset(['all-morphs',
+                                  'partial',
+                                  'marginal',
+                                  'allocate-sentence'])
 
     _NBEST_MAX = 512
 
+    # Parsed (name, value) pairs of option strings seen before, shared by
+    # all instances; values are immutable, and only valid strings are kept
+    _PARSED_STRINGS = {}
+    _PARSED_STRINGS_MAX = 128
+
+    _NEGATIVE_NUMBER = re.compile(r'^-\d+$|^-\d*\.\d+$')
+
     _ERROR_NVALUE = 'Invalid N value'
+    _ERROR_UNRECOGNIZED = 'unrecognized arguments: {}'
+    _ERROR_AMBIGUOUS = 'ambiguous option: {} could match {}'
+    _ERROR_EXPECTED = 'argument {}: expected one argument'
+    _ERROR_IGNORED = 'argument {}: ignored explicit argument {!r}'
+    _ERROR_INVALID = 'argument {}: invalid {} value: {!r}'
     _WARN_LATTICE_LEVEL = ('lattice-level is DEPRECATED, '
                            'please use marginal or nbest')
 
@@ -61,21 +106,11 @@ class OptionParse(object):
         Raises:
             MeCabError: An invalid value for N-best was passed in.
         '''
-        class MeCabArgumentParser(argparse.ArgumentParser):
-            '''MeCab option parser for natto-py.'''
-
-            def error(self, message):
-                '''error(message: string)
-
-                Raises ValueError.
-                '''
-                raise ValueError(message)
-
         options = options or {}
         dopts = {}
 
         if type(options) is dict:
-            for name in iter(list(self._SUPPORTED_OPTS.values())):
+            for name in self._OPTION_NAMES:
                 if name in options:
                     if options[name] or options[name] == '':
                         val = options[name]
@@ -83,82 +118,18 @@ class OptionParse(object):
                             val = self.__bytes2str(options[name])
                         dopts[name] = val
         else:
-            p = MeCabArgumentParser()
-            p.add_argument('-r', '--rcfile',
-                           help='use FILE as a resource file',
-                           action='store', dest='rcfile')
-            p.add_argument('-d', '--dicdir',
-                           help='set DIR as a system dicdir',
-                           action='store', dest='dicdir')
-            p.add_argument('-u', '--userdic',
-                           help='use FILE as a user dictionary',
-                           action='store', dest='userdic')
-            p.add_argument('-l', '--lattice-level',
-                           help='lattice information level (DEPRECATED)',
-                           action='store', dest='lattice_level', type=int)
-            p.add_argument('-O', '--output-format-type',
-                           help='set output format type (wakati, none,...)',
-                           action='store', dest='output_format_type')
-            p.add_argument('-a', '--all-morphs',
-                           help='output all morphs (default false)',
-                           action='store_true', default=False)
-            p.add_argument('-N', '--nbest',
-                           help='output N best results (default 1)',
-                           action='store', dest='nbest', type=int)
-            p.add_argument('-p', '--partial',
-                           help='partial parsing mode (default false)',
-                           action='store_true', default=False)
-            p.add_argument('-m', '--marginal',
-                           help='output marginal probability (default false)',
-                           action='store_true', default=False)
-            p.add_argument('-M', '--max-grouping-size',
-                           help=('maximum grouping size for unknown words '
-                                 '(default 24)'),
-                           action='store', dest='max_grouping_size', type=int)
-            p.add_argument('-F', '--node-format',
-                           help='use STR as the user-defined node format',
-                           action='store', dest='node_format')
-            p.add_argument('-U', '--unk-format',
-                           help=('use STR as the user-defined unknown '
-                                 'node format'),
-                           action='store', dest='unk_format')
-            p.add_argument('-B', '--bos-format',
-                           help=('use STR as the user-defined '
-                                 'beginning-of-sentence format'),
-                           action='store', dest='bos_format')
-            p.add_argument('-E', '--eos-format',
-                           help=('use STR as the user-defined '
-                                 'end-of-sentence format'),
-                           action='store', dest='eos_format')
-            p.add_argument('-S', '--eon-format',
-                           help=('use STR as the user-defined end-of-NBest '
-                                 'format'),
-                           action='store', dest='eon_format')
-            p.add_argument('-x', '--unk-feature',
-                           help='use STR as the feature for unknown word',
-                           action='store', dest='unk_feature')
-            p.add_argument('-b', '--input-buffer-size',
-                           help='set input buffer size (default 8192)',
-                           action='store', dest='input_buffer_size', type=int)
-            p.add_argument('-C', '--allocate-sentence',
-                           help='allocate new memory for input sentence',
-                           action='store_true', dest='allocate_sentence',
-                           default=False)
-            p.add_argument('-t', '--theta',
-                           help=('set temperature parameter theta '
-                                 '(default 0.75)'),
-                           action='store', dest='theta', type=float)
-            p.add_argument('-c', '--cost-factor',
-                           help='set cost factor (default 700)',
-                           action='store', dest='cost_factor', type=int)
-
-            opts = p.parse_args([o.replace('\"', '').replace('\'', '') for o in options.split()])
-
-            for name in iter(list(self._SUPPORTED_OPTS.values())):
-                if hasattr(opts, name):
-                    v = getattr(opts, name)
-                    if v or v == '':
-                        dopts[name] = v
+            parsed = self._PARSED_STRINGS.get(options)
+            if parsed is None:
+                tokens = [o.replace('\"', '').replace('\'', '')
+                          for o in options.split()]
+                parsed = tuple(self.__parse_tokens(tokens))
+                if len(self._PARSED_STRINGS) < self._PARSED_STRINGS_MAX:
+                    self._PARSED_STRINGS[options] = parsed
+            for name, v in parsed:
+                if v or v == '':
+                    dopts[name] = v
+                else:
+                    dopts.pop(name, None)
 
         # final checks
         if 'nbest' in dopts \
@@ -172,6 +143,96 @@ class OptionParse(object):
 
         return dopts
 
+    def __parse_tokens(self, tokens):
+        '''Parses MeCab options given as command-line tokens.
+
+        Accepts the short- and long-forms of the supported options, values
+        either attached (-N2, --nbest=2) or following (-N 2, --nbest 2),
+        bundled short flags (-ap) and unambiguous long-form prefixes.
+
+        Returns:
+            A list of (name, value) pairs in the order given, where the names
+            are snake-cased names of the long-form of the options.
+
+        Raises:
+            ValueError: An unrecognized option, missing value or value of
+                the wrong type was passed in.
+        '''
+        parsed = []
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            i += 1
+            if tok.startswith('--') and len(tok) > 2:
+                key, eq, val = tok[2:].partition('=')
+                name = self.__long_name(key, tok)
+                flag = self._FLAGS[name]
+                if self._OPTION_TYPES[name] is None:
+                    if eq:
+                        raise ValueError(self._ERROR_IGNORED.format(flag, val))
+                    parsed.append((name, True))
+                    continue
+                if not eq:
+                    val, i = self.__next_value(tokens, i, flag)
+            elif tok.startswith('-') and len(tok) > 1:
+                name = self._SUPPORTED_OPTS.get(tok[:2])
+                if name is None:
+                    raise ValueError(self._ERROR_UNRECOGNIZED.format(tok))
+                flag = self._FLAGS[name]
+                if self._OPTION_TYPES[name] is None:
+                    # any remaining characters are more bundled flags
+                    rest = tok[2:]
+                    if rest.startswith('='):
+                        raise ValueError(self._ERROR_IGNORED.format(flag,
+                                                                    rest[1:]))
+                    elif rest and '-' + rest[0] not in self._SUPPORTED_OPTS:
+                        raise ValueError(self._ERROR_IGNORED.format(flag, rest))
+                    parsed.append((name, True))
+                    if rest:
+                        tokens = tokens[:i] + ['-' + rest] + tokens[i:]
+                    continue
+                val = tok[2:]
+                if val.startswith('='):
+                    val = val[1:]
+                elif not val:
+                    val, i = self.__next_value(tokens, i, flag)
+            else:
+                raise ValueError(self._ERROR_UNRECOGNIZED.format(tok))
+
+            vtype = self._OPTION_TYPES[name]
+            try:
+                parsed.append((name, vtype(val)))
+            except ValueError:
+                raise ValueError(
+                    self._ERROR_INVALID.format(flag, vtype.__name__, val))
+        return parsed
+
+    def __long_name(self, key, tok):
+        '''Returns the option name for a long-form key, which may be an
+        unambiguous prefix of the full name.'''
+        name = key.replace('-', '_')
+        if name in self._OPTION_TYPES:
+            return name
+        matches = [n for n in self._OPTION_TYPES if n.startswith(name)]
+        if len(matches) == 1:
+            return matches[0]
+        elif matches:
+            longs = ', '.join('--' + self._LONG_FORMS[m] for m in matches)
+            raise ValueError(self._ERROR_AMBIGUOUS.format(tok, longs))
+        raise ValueError(self._ERROR_UNRECOGNIZED.format(tok))
+
+    def __next_value(self, tokens, i, flag):
+        '''Returns the value token at i for an option, and the next index.
+
+        A token starting with - is taken as the next option rather than a
+        value, unless it is a lone - or a negative number.
+        '''
+        if i >= len(tokens) or (tokens[i].startswith('-') and
+                                tokens[i] != '-' and
+                                not self._NEGATIVE_NUMBER.match(tokens[i])):
+            raise ValueError(self._ERROR_EXPECTED.format(flag))
+        return tokens[i], i + 1
+
     def build_options_str(self, options):
         '''Returns a string concatenation of the MeCab options.
 
@@ -184,9 +245,9 @@ class OptionParse(object):
             MeCab instance, in long-form.
         '''
         opts = []
-        for name in iter(list(self._SUPPORTED_OPTS.values())):
+        for name in self._OPTION_NAMES:
             if name in options:
-                key = name.replace('_', '-')
+                key = self._LONG_FORMS[name]
                 if key in self._BOOLEAN_OPTIONS:
                     if options[name]:
                         opts.append('--{}'.format(key))
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 '''Internal-use functions for Mecab-Python string- and byte-conversion.'''
+import functools
 import re
 
-REGEXTYPE = type(re.compile(''))
+REGEXTYPE = re.Pattern
 
 def string_support(enc):
     '''Create byte-to-string and string-to-byte conversion functions for
@@ -24,9 +25,13 @@ def string_support(enc):
 def splitter_support():
     '''Create tokenizer for use in boundary constraint parsing.'''
 
+    # compiled patterns, so repeated parses with the same constraints do not
+    # go back through re's own cache lookup and type checks
+    _compile = functools.lru_cache(maxsize=256)(re.compile)
+
     def _fn_tokenize_pattern(text, pattern):
         pos = 0
-        for m in re.finditer(pattern, text):
+        for m in _compile(pattern).finditer(text):
             if pos < m.start():
                 token = text[pos:m.start()]
                 yield (token.strip(), False)
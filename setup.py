@@ -70,7 +70,10 @@ setup(
 
     packages=['natto', 'tests'],
 
-    install_requires=['cffi'],
+    install_requires=['cffi>=1.9'],
+
+    # out-of-line ABI mode: generates natto/_mecab_cffi.py, no compiler needed
+    cffi_modules=['natto/binding.py:_ffi_builder'],
 
     zip_safe=False,
 
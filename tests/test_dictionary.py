@@ -28,6 +28,19 @@ class TestDictionary(unittest.TestCase, TestStringSupport):
             self.assertEqual(sysdic.type, 0)
             self.assertEqual(sysdic.version, 102)
 
+    def test_dicts_cached(self):
+        '''Test that dictionary information is built once and reused.'''
+        with mecab.MeCab() as nm:
+            self.assertIs(nm.dicts, nm.dicts)
+
+    def test_dicts_closed(self):
+        '''Test that dictionary information remains available once closed.'''
+        with mecab.MeCab() as nm:
+            pass
+        self.assertGreaterEqual(len(nm.dicts), 1)
+        self.assertIsNotNone(re.search('sys.dic$', nm.dicts[0].filepath))
+        self.assertEqual(nm.dicts[0].type, 0)
+
 '''
 Copyright (c) 2022, Brooke M. Fujita.
 All rights reserved.
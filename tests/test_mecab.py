@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 '''Tests for natto.mecab.'''
 import codecs
+import gc
 import os
 import re
 import sys
+import threading
 import yaml
 import unittest
+import weakref
 import natto.api as api
 import natto.environment as env
 import natto.mecab as mecab
 import natto.support as support
+from concurrent.futures import ThreadPoolExecutor
 from os import path
 from string import Template
 from subprocess import Popen, PIPE
@@ -109,6 +113,57 @@ class TestMecab(unittest.TestCase, TestStringSupport):
             os.environ[mecab.MeCab.MECAB_PATH] = orig_env
 
     # ------------------------------------------------------------------------
+    def test_close(self):
+        '''Test that closing twice is harmless, and parsing once closed
+           raises an error.
+        '''
+        with mecab.MeCab() as nm:
+            gen = nm.parse(self.text, as_nodes=True)
+        nm.__exit__(None, None, None)
+        nm.close()
+
+        # dictionary information and repr remain available
+        self.assertGreaterEqual(len(nm.dicts), 1)
+        self.assertIsNotNone(re.search('dicts=', repr(nm)))
+
+        with self.assertRaises(api.MeCabError):
+            nm.parse(self.text)
+        with self.assertRaises(api.MeCabError):
+            nm.parse_many([self.text])
+        # nor iterating over nodes from a parse before closing
+        with self.assertRaises(api.MeCabError):
+            list(gen)
+
+    def test_no_reference_cycle(self):
+        '''Test that an instance is freed as soon as it is no longer
+           referenced, without waiting for the cyclic garbage collector.
+        '''
+        gc.disable()
+        try:
+            for kwargs in [{}, {'cache_size': 8}]:
+                nm = mecab.MeCab(**kwargs)
+                nm.parse(self.text)
+                ref = weakref.ref(nm)
+                del nm
+                self.assertIsNone(ref())
+        finally:
+            gc.enable()
+
+    def test_parse_atexit(self):
+        '''Test that an instance still in use is not destroyed at interpreter
+           exit before atexit handlers have run.
+        '''
+        script = '\n'.join([
+            'import atexit',
+            'from natto import MeCab',
+            'nm = None',
+            'atexit.register(lambda: print(nm.parse("テスト")))',
+            'nm = MeCab()'])
+        proc = Popen([sys.executable, '-c', script], stdout=PIPE)
+        out = proc.communicate()[0]
+        self.assertEqual(proc.returncode, 0)
+        self.assertIsNotNone(re.search('テスト', self._b2u(out)))
+
     def test_version(self):
         '''Test mecab_version.'''
         with mecab.MeCab() as nm:
@@ -185,6 +240,49 @@ class TestMecab(unittest.TestCase, TestStringSupport):
 
                 self.assertEqual(expected, actual)
 
+    def test_parse_tostr_cached(self):
+        '''Test parsing to string with the LRU result cache enabled.'''
+        with mecab.MeCab() as nm:
+            expected = nm.parse(self.text)
+
+        with mecab.MeCab(cache_size=2) as nm:
+            for _ in range(3):
+                self.assertEqual(nm.parse(self.text), expected)
+            self.assertNotEqual(nm.parse('日本語だよ、これが。'), expected)
+            self.assertEqual(nm.parse(self.text), expected)
+
+            info = nm.cache_info()
+            self.assertEqual(info.hits, 3)
+            self.assertEqual(info.misses, 2)
+            self.assertEqual(info.currsize, 2)
+
+        with mecab.MeCab() as nm:
+            self.assertIsNone(nm.cache_info())
+
+        # constraints are part of the key
+        yml = self.yaml.get('text1')
+        txt = self._u2str(yml.get('text'))
+        pat = self._u2str(yml.get('pattern'))
+        with mecab.MeCab() as nm:
+            plain = nm.parse(txt)
+            bound = nm.parse(txt, boundary_constraints=pat)
+
+        with mecab.MeCab(cache_size=4) as nm:
+            for _ in range(2):
+                self.assertEqual(nm.parse(txt), plain)
+                self.assertEqual(nm.parse(txt, boundary_constraints=pat),
+                                 bound)
+            self.assertEqual(nm.cache_info().misses, 2)
+
+        # keyword arguments not affecting the string result share its key
+        with mecab.MeCab(cache_size=4) as nm:
+            self.assertEqual(nm.parse(txt), plain)
+            self.assertEqual(nm.parse(txt, as_nodes=False), plain)
+            self.assertEqual(nm.parse(txt, as_bytes=True), plain)
+            info = nm.cache_info()
+            self.assertEqual(info.misses, 1)
+            self.assertEqual(info.currsize, 1)
+
     # ------------------------------------------------------------------------
     def test_parse_tonode_default(self):
         '''Test node parsing, skipping over any BOS or EOS nodes.'''
@@ -202,6 +300,24 @@ class TestMecab(unittest.TestCase, TestStringSupport):
                     self.assertEqual(expected[i].surface, s)
                     self.assertEqual(expected[i].feature, f)
 
+    def test_parse_tonode_surfaces(self):
+        '''Test that node surfaces are the exact slices of the input text.'''
+        with mecab.MeCab() as nm:
+            nodes = [n for n in nm.parse(self.text, as_nodes=True)
+                     if not n.is_eos()]
+            self.assertEqual(''.join(n.surface for n in nodes), self.text)
+
+    def test_parse_tonode_asbytes(self):
+        '''Test node parsing leaving surface and feature as bytes.'''
+        with mecab.MeCab() as nm:
+            expected = list(nm.parse(self.text, as_nodes=True))
+            actual = list(nm.parse(self.text, as_nodes=True, as_bytes=True))
+
+            self.assertEqual(len(expected), len(actual))
+            for e, a in zip(expected, actual):
+                self.assertEqual(a.surface, self.s2b(e.surface))
+                self.assertEqual(a.feature, self.s2b(e.feature))
+
     def test_parse_tonode_outputformat_errors(self):
         '''Test node parsing with output formatting errors:
            1. unknown node has no pronunciation value
@@ -216,6 +332,68 @@ class TestMecab(unittest.TestCase, TestStringSupport):
                     list(nm.parse(s, as_nodes=True))
 
     # ------------------------------------------------------------------------
+    def test_parse_many(self):
+        '''Test parsing a list of texts, sequentially and across threads.'''
+        texts = [self.text, '日本語だよ、これが。', self.text, '卓球で俺は']
+        for argf in ['', '-N2']:
+            with mecab.MeCab(argf) as nm:
+                expected = [nm.parse(t) for t in texts]
+                self.assertEqual(nm.parse_many(texts), expected)
+                self.assertEqual(nm.parse_many(texts, workers=3), expected)
+
+                expected = [[(n.surface, n.feature)
+                             for n in nm.parse(t, as_nodes=True)]
+                            for t in texts]
+                for workers in [1, 3]:
+                    actual = [[(n.surface, n.feature) for n in nodes]
+                              for nodes in nm.parse_many(texts,
+                                                         as_nodes=True,
+                                                         workers=workers)]
+                    self.assertEqual(actual, expected)
+
+        with mecab.MeCab() as nm:
+            with self.assertRaises(api.MeCabError):
+                nm.parse_many(['foo', None])
+
+    # ------------------------------------------------------------------------
+    def test_parse_threaded(self):
+        '''Test parsing from many threads sharing one MeCab instance.'''
+        texts = [self.text, '日本語だよ、これが。', 'ヒーロー見参！'] * 8
+        for argf in ['', '-N2']:
+            with mecab.MeCab(argf) as nm:
+                expected = [nm.parse(t) for t in texts]
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    actual = list(executor.map(nm.parse_threaded, texts))
+                self.assertEqual(expected, actual)
+
+                nodes = [n.surface for n in nm.parse(self.text, as_nodes=True)]
+                actual = [n.surface for n in
+                          nm.parse_threaded(self.text, as_nodes=True)]
+                self.assertEqual(nodes, actual)
+
+    def test_parse_threaded_release(self):
+        '''Test parsing from many short-lived threads, and reading the nodes
+           parsed by a thread after it has exited.
+        '''
+        with mecab.MeCab() as nm:
+            expected = nm.parse(self.text)
+            results = []
+            for _ in range(200):
+                t = threading.Thread(
+                    target=lambda: results.append(nm.parse_threaded(self.text)))
+                t.start()
+                t.join()
+            self.assertEqual(results, [expected] * 200)
+            self.assertEqual(nm.parse_threaded(self.text), expected)
+
+            surfaces = [n.surface for n in nm.parse(self.text, as_nodes=True)]
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [executor.submit(nm.parse_threaded, self.text,
+                                           as_nodes=True) for _ in range(4)]
+            for future in futures:
+                self.assertEqual([n.surface for n in future.result()],
+                                 surfaces)
+
     def test_parse_tostr_partial(self):
         '''Test -p / --partial parsing to string.'''
         with mecab.MeCab('-p') as nm:
@@ -361,6 +539,20 @@ class TestMecab(unittest.TestCase, TestStringSupport):
                         self.assertEqual(node.surface, expected[i])
 
     # ------------------------------------------------------------------------
+    def test_parse_boundary_whitespace(self):
+        '''Test boundary constraint parsing with a pattern matching
+           whitespace, which is dropped from the sentence.
+        '''
+        txt = 'テスト です 。'
+        with mecab.MeCab() as nm:
+            expected = nm.parse('テストです。')
+            actual = nm.parse(txt, boundary_constraints=r'\s+')
+            self.assertEqual(actual, expected)
+
+            gen = nm.parse(txt, boundary_constraints=r'\s+', as_nodes=True)
+            surfaces = [n.surface for n in gen if not n.is_eos()]
+            self.assertEqual(surfaces, ['テスト', 'です', '。'])
+
     def test_parse_tostr_feature(self):
         '''Test feature constraint parsing to string (output format does NOT apply).'''
         with mecab.MeCab(r'-F%m,%f[0],%s\n') as nm:
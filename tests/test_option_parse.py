@@ -87,6 +87,14 @@ class TestOptionParse(unittest.TestCase, TestStringSupport):
         dopts = self.op.parse_mecab_options({'all_morphs':True})
         self.assertDictEqual(dopts, {'all_morphs':True})
 
+        # ValueError with message if all-morphs is given a value
+        for opts in ['-a=1', '--all-morphs=1']:
+            with self.assertRaises(ValueError) as ctx:
+                self.op.parse_mecab_options(opts)
+            self.assertEqual(str(ctx.exception),
+                             "argument -a/--all-morphs: "
+                             "ignored explicit argument '1'")
+
     def test_parse_mecab_options_nbest(self):
         '''Test option-parsing: nbest.'''
         dopts = self.op.parse_mecab_options('-N2')
@@ -176,6 +184,13 @@ class TestOptionParse(unittest.TestCase, TestStringSupport):
         dopts = self.op.parse_mecab_options({'unk_format':r'???\n'})
         self.assertDictEqual(dopts, {'unk_format': r'???\n'})
 
+        # a lone - is a value, not an option
+        dopts = self.op.parse_mecab_options('-U -')
+        self.assertDictEqual(dopts, {'unk_format':'-'})
+
+        dopts = self.op.parse_mecab_options('--unk-format - -a')
+        self.assertDictEqual(dopts, {'unk_format':'-', 'all_morphs':True})
+
     def test_parse_mecab_options_bosformat(self):
         '''Test option-parsing: bos-format.'''
         dopts = self.op.parse_mecab_options(r'-B>>>\n')
@@ -301,6 +316,17 @@ class TestOptionParse(unittest.TestCase, TestStringSupport):
             self.op.parse_mecab_options('-c0.99')
         self.assertIsNotNone(re.search('--cost-factor', str(ctx.exception)))
 
+    def test_parse_mecab_options_repeated(self):
+        '''Test option-parsing: the same string parsed again, including by
+           another instance, gives an equal but separate dictionary.
+        '''
+        opts = '-d/foo/bar -N2 -a'
+        dopts1 = self.op.parse_mecab_options(opts)
+        dopts1['nbest'] = 99
+        dopts2 = OptionParse(self.env.charset).parse_mecab_options(opts)
+        self.assertDictEqual(dopts2,
+                             {'dicdir':'/foo/bar', 'nbest':2, 'all_morphs':True})
+
     def test_build_options_str(self):
         '''Test option-building logic.'''
         opts = self.op.build_options_str(